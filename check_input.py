@@ -2,12 +2,12 @@
 
 def get_int_range(prompt: str, low: int, high: int) -> int:
     while True: 
-        raw = input(prompt)
-        try:
-            value = int(raw)
-        except ValueError:
+        raw = input(prompt).strip()
+        digits = raw[1:] if raw.startswith("-") else raw
+        if not digits.isdecimal():
             print("please enter an integer")
-        if value < low or value > high:
-            print(f"Please enter an integer between {low} and {high}")
             continue
-        return value
\ No newline at end of file
+        value = int(raw)
+        if low <= value <= high:
+            return value
+        print(f"Please enter an integer between {low} and {high}")
\ No newline at end of file
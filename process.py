@@ -1,161 +1,527 @@
+import asyncio
+import multiprocessing
+import os
 import subprocess
+import tempfile
 import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from PIL import Image
 import check_input
 
+try:
+    import pymupdf as fitz  # PyMuPDF 1.24.3+, the fitz name is deprecated there
+except ImportError:
+    try:
+        import fitz  # older PyMuPDF
+    except ImportError:
+        fitz = None
 
-class PDFProcessor:
-    def __init__(self, base_dir: Path):
-        self.base_dir = base_dir
-        self.input_dir = base_dir / "input"
-        self.ocr_dir = base_dir / "ocr_output"
-        self.images_dir = base_dir / "images"
-        self.meta_dir = base_dir / "metadata"
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
 
-        for d in (self.input_dir, self.ocr_dir, self.images_dir, self.meta_dir):
-            d.mkdir(exist_ok=True)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-    def run_cmd(self, cmd):
-        p = subprocess.run(cmd, capture_output=True, text=True)
-        return p.returncode, p.stdout, p.stderr
 
-    def is_digital_pdf(self, pdf_path: Path) -> bool:
-        """Digital PDFs have fonts. Scanned PDFs usually don't."""
-        _, out, _ = self.run_cmd(["pdffonts", str(pdf_path)])
-        lines = out.strip().splitlines()
-        return len(lines) > 2 
+def _dumps(data, ensure_ascii: bool = False) -> str:
+    """
+    Indented JSON, using orjson when it is installed.
+    Non ASCII characters are written as UTF-8 rather than \\u escapes, orjson has
+    no ensure_ascii option so the stdlib path matches it. ensure_ascii=True always
+    goes through the stdlib.
+    """
+    if orjson is not None and not ensure_ascii:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2, ensure_ascii=ensure_ascii)
 
-    def run_ocr(self, input_pdf: Path, output_pdf: Path) -> bool:
-        """
-        Run OCRmyPDF, returns True if output file exists and is non empty.
-        """
-        cmd = [
-            "ocrmypdf",
-            "--skip-text",
-            "--pdf-renderer", "hocr",
-            "--output-type", "pdf",
-            "--optimize", "0",
-            "--jobs", "1",
-            str(input_pdf),
-            str(output_pdf),
-        ]
-        code, out, err = self.run_cmd(cmd)
-        ok = output_pdf.exists() and output_pdf.stat().st_size > 0
-        if not ok:
-            print(f"[WARNING] OCRmyPDF did not produce an output PDF for {input_pdf.name}.")
-            if err.strip():
-                print(err.strip())
-        return ok
 
-    def extract_images(self, pdf_path: Path, pdf_stem: str):
-        """
-        Use pdfimages to extract embedded raster images only
-        """
-        raw_prefix = self.images_dir / f"{pdf_stem}_RAW_"
+# Raised for strings that cannot be UTF-8, e.g. lone surrogates from undecodable file names
+_ENCODE_ERRORS = (UnicodeEncodeError,) + ((orjson.JSONEncodeError,) if orjson is not None else ())
 
-        # clean leftovers from previous runs
-        for old in self.images_dir.glob(f"{pdf_stem}_RAW_*.png"):
-            old.unlink()
 
-        self.run_cmd(["pdfimages", "-png", str(pdf_path), str(raw_prefix)])
-        raw_images = sorted(self.images_dir.glob(f"{pdf_stem}_RAW_*.png"))
+def _to_utf8(render) -> bytes:
+    """
+    Calls render(ensure_ascii) and encodes the result. Falls back to \\u escapes
+    when the UTF-8 text cannot be produced.
+    """
+    try:
+        return render(False).encode("utf-8")
+    except _ENCODE_ERRORS:
+        return render(True).encode("utf-8")
+
+
+def _write_json(json_path: Path, data):
+    json_path.write_bytes(_to_utf8(lambda ensure_ascii: _dumps(data, ensure_ascii)))
+
+
+# Layout of every PXXXX_index.JSON, same as json.dump(..., indent=2, ensure_ascii=False)
+# of the full dict. Only the per-paper values are encoded at write time.
+_INDEX_TEMPLATE = """{{
+  "paper_ID": {pid},
+  "access": "private",
+  "paper_access": "private",
+  "paper_title": "",
+  "authors": [],
+  "pdf_id": {pdf_id},
+  "pdf_path": {pdf_path},
+  "year": null,
+  "journal": "",
+  "figures": {figs},
+  "citation": {{
+    "APA": ""
+  }}
+}}"""
+
+# Set to True to parse every rendered index back before it is written.
+_VALIDATE_INDEX_JSON = False
+
+
+def _write_index_json(json_path: Path, paper_id: str, pdf_name: str, figures):
+    """Writes an index file from _INDEX_TEMPLATE."""
+    def render(ensure_ascii):
+        return _INDEX_TEMPLATE.format(
+            pid=_dumps(paper_id, ensure_ascii),
+            pdf_id=_dumps(pdf_name, ensure_ascii),
+            pdf_path=_dumps(f"data/research_center/{paper_id}/{pdf_name}", ensure_ascii),
+            # figures sits one level deep, indent its continuation lines to match
+            figs=_dumps(figures, ensure_ascii).replace("\n", "\n  "),
+        )
 
-        figures = []
-        for idx, raw_img in enumerate(raw_images, start=1):
+    data = _to_utf8(render)
+    if _VALIDATE_INDEX_JSON:
+        json.loads(data)
+    json_path.write_bytes(data)
+
+
+def _read_json(json_path: Path):
+    """Reads a JSON file, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(json_path.read_bytes())
+    with open(json_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _run_cmd(cmd, capture_stdout=True, capture_stderr=True, env=None):
+    """
+    Runs cmd and returns (returncode, stdout, stderr).
+    Streams that are not captured go to DEVNULL and come back as empty strings.
+    Module level so the pool workers can use it too.
+    """
+    p = subprocess.run(
+        cmd,
+        stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+        stderr=subprocess.PIPE if capture_stderr else subprocess.DEVNULL,
+        text=True,
+        env=env,
+    )
+    return p.returncode, p.stdout or "", p.stderr or ""
+
+
+def _resources_have_fonts(resources, seen: set) -> bool:
+    """
+    True if a pypdf /Resources dict, or any Form XObject it uses, has a non empty /Font dict.
+    seen holds the ids of forms already visited, forms can be shared and reference each other.
+    """
+    if "/Font" in resources and len(resources["/Font"]) > 0:
+        return True
+    if "/XObject" not in resources:
+        return False
+    for ref in resources["/XObject"].values():
+        xobj = ref.get_object()
+        if id(xobj) in seen:
+            continue
+        seen.add(id(xobj))
+        if xobj.get("/Subtype") == "/Form" and "/Resources" in xobj:
+            if _resources_have_fonts(xobj["/Resources"], seen):
+                return True
+    return False
+
+
+def _has_fonts(pdf_path: str) -> bool:
+    """
+    Probes a PDF for fonts. Results are memoized by PDFProcessor.is_digital_pdf.
+    Tries PyMuPDF, then pypdf, then pdffonts, whichever is available first.
+    """
+    # PyMuPDF lists page and Form XObject fonts from C without decoding any image,
+    # so it stays fast on large scanned PDFs where no page has fonts
+    if fitz is not None:
+        try:
+            with fitz.open(pdf_path) as doc:
+                return any(page.get_fonts() for page in doc)
+        except Exception:
+            pass
+
+    # pypdf covers page and Form XObject fonts, which is what text pages use; unlike
+    # pdffonts it does not look inside annotation appearances or Type 3 glyph procedures.
+    # It is much slower than PyMuPDF on scanned PDFs, reading each XObject pulls in its stream.
+    if PdfReader is not None:
+        try:
+            reader = PdfReader(pdf_path)
+            seen = set()
+            return any(
+                _resources_have_fonts(page["/Resources"], seen)
+                for page in reader.pages
+                if "/Resources" in page
+            )
+        except Exception:
+            pass
+
+    _, out, _ = _run_cmd(["pdffonts", pdf_path], capture_stderr=False)
+    lines = out.strip().splitlines()
+    return len(lines) > 2
+
+
+def _ocr_parallelism(n_pdfs: int):
+    """Returns (workers, jobs) so that workers * jobs stays around the core count."""
+    cpus = os.cpu_count() or 1
+    workers = max(1, min(cpus // 2, n_pdfs))
+    jobs = max(1, cpus // workers)
+    return workers, jobs
+
+
+def _ocr_cmd(input_pdf: str, output_pdf: str, jobs: int):
+    return [
+        "ocrmypdf",
+        "--skip-text",
+        "--pdf-renderer", "hocr",
+        "--output-type", "pdf",
+        "--optimize", "0",
+        "--jobs", str(jobs),
+        input_pdf,
+        output_pdf,
+    ]
+
+
+def _ocr_env():
+    # OCRmyPDF already runs one Tesseract per page up to --jobs, keep each of them single threaded
+    return {"OMP_THREAD_LIMIT": "1", **os.environ}
+
+
+def _run_ocr_worker(task):
+    """
+    Runs OCRmyPDF on a single PDF. Lives at module level so it can be sent to a process pool.
+    Returns (ok, stderr).
+    """
+    input_pdf, output_pdf, jobs = task
+    _, _, err = _run_cmd(_ocr_cmd(input_pdf, output_pdf, jobs), capture_stdout=False, env=_ocr_env())
+    output_pdf = Path(output_pdf)
+    ok = output_pdf.exists() and output_pdf.stat().st_size > 0
+    return ok, err
+
+
+def _extract_images(pdf_path: Path, pdf_stem: str, images_dir: Path):
+    """
+    Extract embedded raster images only, into images_dir/<pdf_stem>/.
+    Uses PyMuPDF in process when it is installed, pdfimages otherwise.
+    """
+    # one folder per PDF, so PDFs extracted at the same time never write the same F{idx}.png
+    out_dir = images_dir / pdf_stem
+    out_dir.mkdir(exist_ok=True)
+    if fitz is None:
+        return _extract_images_pdfimages(pdf_path, pdf_stem, out_dir)
+
+    # plain strings in the loop, this runs once per embedded image
+    img_dir_prefix = str(out_dir) + os.sep
+    rel_prefix = f"data/research_center/{pdf_stem}/"
+    figures = []
+    with fitz.open(pdf_path) as doc:
+        for page in doc:
+            for img in page.get_images(full=True):
+                new_name = f"F{len(figures) + 1}.png"
+                try:
+                    pix = fitz.Pixmap(doc, img[0])
+                    # PNG only takes gray or RGB (+ alpha)
+                    if pix.n - pix.alpha > 3:
+                        pix = fitz.Pixmap(fitz.csRGB, pix)
+                    # img[1] is the xref of the soft mask, keep the transparency
+                    if img[1]:
+                        try:
+                            mask = fitz.Pixmap(doc, img[1])
+                            # a PDF soft mask may have its own resolution
+                            if (mask.width, mask.height) != (pix.width, pix.height):
+                                mask = fitz.Pixmap(mask, pix.width, pix.height, None)
+                            pix = fitz.Pixmap(pix, mask)
+                        except Exception:
+                            pass  # still save the image, just without transparency
+                    pix.save(img_dir_prefix + new_name)
+                except Exception as e:
+                    print(f"[WARNING] Could not extract image {img[0]} from {pdf_path.name}: {e}")
+                    continue
+
+                figures.append({
+                    "figure_ID": new_name,
+                    "caption": "",
+                    "image_path": rel_prefix + new_name,
+                })
+
+    return figures
+
+
+def _extract_images_pdfimages(pdf_path: Path, pdf_stem: str, out_dir: Path):
+    """
+    Use pdfimages to extract embedded raster images only, into out_dir.
+    The raw files go to a private temp folder next to the images, so they can be
+    renamed into place and whatever is left is removed with the folder.
+    """
+    img_dir_prefix = str(out_dir) + os.sep
+    rel_prefix = f"data/research_center/{pdf_stem}/"
+    figures = []
+    with tempfile.TemporaryDirectory(prefix=".RAW_", dir=out_dir) as tmp:
+        _run_cmd(
+            ["pdfimages", "-png", str(pdf_path), os.path.join(tmp, "img")],
+            capture_stdout=False,
+            capture_stderr=False,
+        )
+        with os.scandir(tmp) as it:
+            raw_names = sorted(e.name for e in it)
+
+        tmp_prefix = tmp + os.sep
+        for idx, raw_name in enumerate(raw_names, start=1):
+            raw_img = tmp_prefix + raw_name
             new_name = f"F{idx}.png"
-            new_path = self.images_dir / new_name
+            new_path = img_dir_prefix + new_name
             try:
-                img = Image.open(raw_img)
-                img.save(new_path, format="PNG")
-                raw_img.unlink(missing_ok=True)
+                if raw_name.lower().endswith(".png"):
+                    # pdfimages -png already wrote a valid PNG, just move it
+                    os.replace(raw_img, new_path)
+                else:
+                    with Image.open(raw_img) as img:
+                        img.save(new_path, format="PNG")
             except Exception as e:
-                print(f"[WARNING] Could not convert {raw_img.name}: {e}")
+                print(f"[WARNING] Could not convert {raw_name} from {pdf_path.name}: {e}")
                 continue
 
             figures.append({
                 "figure_ID": new_name,
                 "caption": "",
-                "image_path": f"data/research_center/{pdf_stem}/{new_name}",
+                "image_path": rel_prefix + new_name,
             })
 
-        return figures
+    return figures
 
-    def build_index_json(self, pdf_name: str, pdf_stem: str, figures):
-        """
-        Builds a JSON file and saves it as PXXXX_index.JSON.
-        """
-        result = {
-            "paper_ID": pdf_stem,
-            "access": "private",
-            "paper_access": "private",
 
-            "paper_title": "",
-            "authors": [],
+def _process_one_pdf(task):
+    """
+    Extracts the images of a single digital PDF. Lives at module level so it can be sent to a process pool.
+    Returns (pdf_name, pdf_stem, figures) for the parent to build the JSON index.
+    """
+    pdf_path, images_dir = task
+    try:
+        figures = _extract_images(pdf_path, pdf_path.stem, images_dir)
+    except Exception as e:
+        # one unreadable PDF should not take the rest of the batch down with it
+        print(f"[WARNING] Could not extract images from {pdf_path.name}: {e}")
+        figures = []
+    return pdf_path.name, pdf_path.stem, figures
+
+
+class PDFProcessor:
+    def __init__(self, base_dir: Path):
+        self.base_dir = base_dir
+        self.input_dir = base_dir / "input"
+        self.ocr_dir = base_dir / "ocr_output"
+        self.images_dir = base_dir / "images"
+        self.meta_dir = base_dir / "metadata"
+
+        for d in (self.input_dir, self.ocr_dir, self.images_dir, self.meta_dir):
+            d.mkdir(exist_ok=True)
 
-            "pdf_id": pdf_name,
-            "pdf_path": f"data/research_center/{pdf_stem}/{pdf_name}",
+        # is_digital_pdf results from previous runs, keyed by "path:mtime_ns:size"
+        self._digital_cache_path = self.meta_dir / ".digital_cache.json"
+        self._digital_cache: dict[str, bool] = {}
+        if self._digital_cache_path.exists():
+            try:
+                cache = _read_json(self._digital_cache_path)
+            except (OSError, ValueError):
+                cache = None
+            if isinstance(cache, dict):
+                self._digital_cache = {k: v for k, v in cache.items() if isinstance(v, bool)}
+            else:
+                print("[WARNING] Could not read the digital PDF cache, rebuilding it.")
+
+    async def run_cmd_async(self, cmd, env=None, capture_stdout=True, capture_stderr=True):
+        p = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE if capture_stdout else asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE if capture_stderr else asyncio.subprocess.DEVNULL,
+            env=env,
+        )
+        out, err = await p.communicate()
+        return (
+            p.returncode,
+            (out or b"").decode(errors="replace"),
+            (err or b"").decode(errors="replace"),
+        )
 
-            "year": None,
-            "journal": "",
+    def is_digital_pdf(self, pdf_path: Path) -> bool:
+        """Digital PDFs have fonts. Scanned PDFs usually don't."""
+        # re-runs ask about the same PDFs again, only probe once per file version
+        key = self._digital_cache_key(pdf_path)
+        if key in self._digital_cache:
+            return self._digital_cache[key]
 
-            "figures": figures,
+        self._digital_cache[key] = _has_fonts(str(pdf_path))
+        return self._digital_cache[key]
 
-            "citation": {
-                "APA": ""
-            }
-        }
+    def _digital_cache_key(self, pdf_path: Path):
+        """Returns "path:mtime_ns:size", so an edited PDF gets a new key."""
+        st = pdf_path.stat()
+        return f"{pdf_path}:{st.st_mtime_ns}:{st.st_size}"
 
+    def save_digital_cache(self):
+        try:
+            _write_json(self._digital_cache_path, self._digital_cache)
+        except OSError as e:
+            print(f"[WARNING] Could not save the digital PDF cache: {e}")
+
+    def extract_images(self, pdf_path: Path, pdf_stem: str):
+        """
+        Extract embedded raster images only.
+        Uses PyMuPDF in process when it is installed, pdfimages otherwise.
+        """
+        return _extract_images(pdf_path, pdf_stem, self.images_dir)
+
+    def build_index_json(self, pdf_name: str, pdf_stem: str, figures):
+        """
+        Builds a JSON file and saves it as PXXXX_index.JSON.
+        """
         json_path = self.meta_dir / f"{pdf_stem}_index.JSON"
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2)
+        _write_index_json(json_path, pdf_stem, pdf_name, figures)
 
         print(f"[✓] {len(figures)} figures → {json_path}")
 
-    def ocr_only_all(self):
-        """Run OCR on all PDFs in the input directory.
-        Skips PDFS that already have fonts"""
+    def classify_pdfs(self):
+        """
+        Splits the PDFs in the input directory into (digital, scanned) lists in one pass.
+        """
         pdfs = sorted(self.input_dir.glob("*.pdf"))
-        if not pdfs:
+        if fitz is None and PdfReader is None:
+            # each probe is a pdffonts subprocess, threads can wait on several at once
+            with ThreadPoolExecutor(max_workers=8) as ex:
+                results = list(ex.map(self.is_digital_pdf, pdfs))
+        else:
+            # in-process probes hold the GIL (pypdf is pure Python), threads would not help
+            results = [self.is_digital_pdf(p) for p in pdfs]
+
+        # forget PDFs that were deleted or changed since they were cached, so the file does not only grow
+        seen = {self._digital_cache_key(p) for p in pdfs}
+        self._digital_cache = {k: v for k, v in self._digital_cache.items() if k in seen}
+        self.save_digital_cache()
+
+        digital = [p for p, is_digital in zip(pdfs, results) if is_digital]
+        scanned = [p for p, is_digital in zip(pdfs, results) if not is_digital]
+        return digital, scanned
+
+    def ocr_only_all(self, partition=None):
+        """Run OCR on all PDFs in the input directory.
+        Skips PDFS that already have fonts.
+        partition is the (digital, scanned) result of classify_pdfs, computed here if not given."""
+        digital, scanned = partition if partition is not None else self.classify_pdfs()
+        if not digital and not scanned:
             print("No PDFs found in /input")
             return
 
-        for pdf_path in pdfs:
-            pdf_stem = pdf_path.stem
+        for pdf_path in digital:
             print(f"\nOCR check → {pdf_path.name}")
+            print("[WARNING] Fonts detected. No OCR needed.")
 
-            if self.is_digital_pdf(pdf_path):
-                print("[WARNING] Fonts detected. No OCR needed.")
-                continue
-
-            ocr_pdf = self.ocr_dir / f"{pdf_stem}_ocr.pdf"
-            print("[✓] Running OCR on PDF...")
-            ok = self.run_ocr(pdf_path, ocr_pdf)
-            if ok:
-                print(f"[✓] OCR output → {ocr_pdf}")
-            else:
-                print("[ERROR] OCR failed or produced no file.")
+        worklist = [(pdf_path, self.ocr_dir / f"{pdf_path.stem}_ocr.pdf") for pdf_path in scanned]
+        if not worklist:
+            return
 
-    def extract_images_and_json_all(self):
-        """Extract images and build JSON for all PDFs in the input directory."""
-        pdfs = sorted(self.input_dir.glob("*.pdf"))
-        if not pdfs:
+        # OCR is CPU bound per file but independent across files, so run several
+        # OCRmyPDF processes at once and split the cores between them.
+        workers, jobs = _ocr_parallelism(len(worklist))
+        tasks = [(str(pdf_path), str(ocr_pdf), jobs) for pdf_path, ocr_pdf in worklist]
+        print(f"\n[✓] Running OCR on {len(worklist)} PDF(s) with {workers} worker(s)...")
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for (pdf_path, ocr_pdf), (ok, err) in zip(worklist, pool.map(_run_ocr_worker, tasks)):
+                if ok:
+                    print(f"[✓] OCR output → {ocr_pdf}")
+                else:
+                    print(f"[ERROR] OCR failed or produced no file for {pdf_path.name}.")
+                    if err.strip():
+                        print(err.strip())
+
+    def extract_images_and_json_all(self, partition=None):
+        """Extract images and build JSON for all PDFs in the input directory.
+        partition is the (digital, scanned) result of classify_pdfs, computed here if not given."""
+        digital, scanned = partition if partition is not None else self.classify_pdfs()
+        if not digital and not scanned:
             print("No PDFs found in /input")
             return
 
-        for pdf_path in pdfs:
-            pdf_stem = pdf_path.stem
+        for pdf_path in scanned:
             print(f"\nImages + JSON → {pdf_path.name}")
+            print("[WARNING] No fonts detected. Treating as manual.")
+            #Builds an empty JSON index file with empty figures list
+            self.build_index_json(pdf_path.name, pdf_path.stem, figures=[])
 
-            if not self.is_digital_pdf(pdf_path):
-                print("[WARNING] No fonts detected. Treating as manual.")
-                #Builds an empty JSON index file with empty figures list
-                self.build_index_json(pdf_path.name, pdf_stem, figures=[])
-                continue
+        if not digital:
+            return
+
+        # Each PDF is independent, so extract in worker processes.
+        # JSON files are still written here in the parent.
+        # Option 4 starts this pool from a thread while the event loop runs OCR, so spawn
+        # the workers rather than fork a process that has other threads holding locks.
+        tasks = [(pdf_path, self.images_dir) for pdf_path in digital]
+        workers = max(1, min((os.cpu_count() or 1) - 1, len(tasks)))
+        print(f"\n[✓] Extracting embedded images from {len(tasks)} PDF(s) with {workers} worker(s)...")
+        with multiprocessing.get_context("spawn").Pool(workers) as pool:
+            for result in pool.imap_unordered(_process_one_pdf, tasks):
+                self.build_index_json(*result)
+
+    async def ocr_only_all_async(self, partition=None):
+        """Same as ocr_only_all, but drives the OCRmyPDF processes from an event loop."""
+        _, scanned = partition if partition is not None else self.classify_pdfs()
+        if not scanned:
+            return
+
+        workers, jobs = _ocr_parallelism(len(scanned))
+        limit = asyncio.Semaphore(workers)
+
+        async def ocr_one(pdf_path: Path):
+            ocr_pdf = self.ocr_dir / f"{pdf_path.stem}_ocr.pdf"
+            async with limit:
+                print(f"[✓] Running OCR on {pdf_path.name}...")
+                _, _, err = await self.run_cmd_async(
+                    _ocr_cmd(str(pdf_path), str(ocr_pdf), jobs), env=_ocr_env(), capture_stdout=False
+                )
+            if ocr_pdf.exists() and ocr_pdf.stat().st_size > 0:
+                print(f"[✓] OCR output → {ocr_pdf}")
+            else:
+                print(f"[ERROR] OCR failed or produced no file for {pdf_path.name}.")
+                if err.strip():
+                    print(err.strip())
 
-            print("[✓] Fonts detected. Extracting embedded images...")
-            figures = self.extract_images(pdf_path, pdf_stem)
-            self.build_index_json(pdf_path.name, pdf_stem, figures)
+        await asyncio.gather(*(ocr_one(p) for p in scanned))
+
+    async def extract_images_and_json_all_async(self, partition=None):
+        """
+        Same as extract_images_and_json_all, run off the event loop.
+        The extraction already fans out to a process pool, so a thread is enough here.
+        """
+        await asyncio.to_thread(self.extract_images_and_json_all, partition)
+
+    async def ocr_and_extract_all_async(self):
+        """
+        OCR only touches scanned PDFs and extraction only touches digital ones,
+        so both phases can run at the same time. The PDFs are classified once up front.
+        """
+        partition = self.classify_pdfs()
+        if not any(partition):
+            print("No PDFs found in /input")
+            return
+        await asyncio.gather(
+            self.ocr_only_all_async(partition),
+            self.extract_images_and_json_all_async(partition),
+        )
 
 
 class ManualImageIndexer:
@@ -170,56 +536,42 @@ class ManualImageIndexer:
         self.images_dir.mkdir(exist_ok=True)
         self.meta_dir.mkdir(exist_ok=True)
 
+    def default_image_folder(self, paper_id: str) -> Path:
+        """images/<paper_id> when it exists, which is where extraction puts a paper's images, else images."""
+        paper_dir = self.images_dir / paper_id
+        return paper_dir if paper_dir.is_dir() else self.images_dir
+
     def build_from_images(self, paper_id: str, image_folder: Path = None):
         if image_folder is None:
-            image_folder = self.images_dir
+            image_folder = self.default_image_folder(paper_id)
 
         if not image_folder.exists():
             print(f"[ERROR] Image folder does not exist: {image_folder}")
             return
 
-        image_files = sorted(
-            [p for p in image_folder.iterdir()
-             if p.suffix.lower() in {".png", ".jpg", ".jpeg"}]
-        )
+        with os.scandir(image_folder) as it:
+            # normcase keeps the order sorted Path objects gave, case insensitive on Windows
+            image_names = sorted(
+                (e.name for e in it
+                 if e.name.lower().endswith((".png", ".jpg", ".jpeg"))),
+                key=os.path.normcase,
+            )
 
-        if not image_files:
+        if not image_names:
             print(f"[WARNING] No image files found in {image_folder}")
             return
 
+        rel_prefix = f"data/research_center/{paper_id}/"
         figures = []
-        for img_path in image_files:
-            image_name = img_path.name
+        for image_name in image_names:
             figures.append({
                 "figure_ID": image_name,
                 "caption": "",
-                "image_path": f"data/research_center/{paper_id}/{image_name}",
+                "image_path": rel_prefix + image_name,
             })
 
-        result = {
-            "paper_ID": paper_id,
-            "access": "private",
-            "paper_access": "private",
-
-            "paper_title": "",
-            "authors": [],
-
-            "pdf_id": f"{paper_id}.pdf",
-            "pdf_path": f"data/research_center/{paper_id}/{paper_id}.pdf",
-
-            "year": None,
-            "journal": "",
-
-            "figures": figures,
-
-            "citation": {
-                "APA": ""
-            }
-        }
-
         json_path = self.meta_dir / f"{paper_id}_index.JSON"
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2)
+        _write_index_json(json_path, paper_id, f"{paper_id}.pdf", figures)
 
         print(f"[✓] Manual image index for {paper_id} → {json_path}")
 
@@ -249,17 +601,17 @@ def main():
                 print("[ERROR] Paper ID cannot be blank.")
                 continue
             folder_str = input(
-                "Image folder (press Enter for default 'images' folder): "
+                f"Image folder (press Enter for default 'images/{paper_id}' folder, "
+                "or 'images' if that does not exist): "
             ).strip()
             if folder_str:
                 image_folder = Path(folder_str)
             else:
-                image_folder = manual_indexer.images_dir
+                image_folder = manual_indexer.default_image_folder(paper_id)
 
             manual_indexer.build_from_images(paper_id, image_folder=image_folder)
         elif choice == 4:
-            processor.ocr_only_all()
-            processor.extract_images_and_json_all()
+            asyncio.run(processor.ocr_and_extract_all_async())
         elif choice == 5:
             print("Exiting...")
             break